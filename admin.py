@@ -1,89 +1,144 @@
-import os
+import asyncio
 import base64
-from fastapi import FastAPI, HTTPException
+import msgspec
+import orjson
+from fastapi import FastAPI, HTTPException, Query, Request, Response
+from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, model_validator
-from typing import List, Optional
-from motor.motor_asyncio import AsyncIOMotorClient
-from bson import ObjectId, Binary
-from dotenv import load_dotenv
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from pydantic import BaseModel, ConfigDict, TypeAdapter, ValidationError
+from typing import Any, List, Optional
+from bson import Decimal128, ObjectId, json_util
+from pymongo.errors import BulkWriteError, DuplicateKeyError, PyMongoError, ServerSelectionTimeoutError
+from fastapi_cache import FastAPICache
+from fastapi_cache.backends.inmemory import InMemoryBackend
+from fastapi_cache.coder import Coder
+from fastapi_cache.decorator import cache
 import datetime
+from cachetools import TTLCache
+from mongo import client, MONGODB_DB_NAME
+from db_connection import Database, field_getter, to_doc
 
 
-load_dotenv()
+def _bson_default(obj):
+    if isinstance(obj, ObjectId):
+        return str(obj)
+    if isinstance(obj, bytes):
+        return base64.b64encode(obj).decode('utf-8')
+    if isinstance(obj, Decimal128):
+        return str(obj)
+    # Remaining BSON types (Timestamp, Regex, MinKey, ...) go out as Extended JSON;
+    # raises TypeError for anything that isn't BSON either
+    return json_util.default(obj)
 
 
-MONGODB_URI = os.getenv("MONGODB_URI")
-MONGODB_DB_NAME = os.getenv("MONGODB_DB_NAME")
+_struct_encoder = msgspec.json.Encoder(enc_hook=_bson_default)
 
-if not MONGODB_URI or not MONGODB_DB_NAME:
-    raise ValueError("Required MongoDB configuration is missing in the .env file")
 
+def _encode(data, schema=None):
+    # With a msgspec schema the data is converted to typed structs and encoded by msgspec;
+    # stored documents that don't fit the schema are encoded as they are instead of failing
+    if schema is not None:
+        try:
+            return _struct_encoder.encode(msgspec.convert(data, schema))
+        except msgspec.ValidationError:
+            pass
+    return orjson.dumps(data, default=_bson_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+def json_response(data, schema=None):
+    return Response(_encode(data, schema), media_type="application/json")
+
+
+def json_array_response(documents, schema=None):
+    """Encodes a list of documents one at a time, so one odd document only affects itself."""
+    body = b"[" + b",".join(_encode(document, schema) for document in documents) + b"]"
+    return Response(body, media_type="application/json")
+
+
+# Documents read and encoded before a streamed response sends its headers
+STREAM_FIRST_BATCH = 100
+
+
+async def _stream_json_array(head, more, cursor, schema=None):
+    yield b"[" + head
+    if more:
+        async for document in cursor:
+            yield b"," + _encode(document, schema)
+    yield b"]"
+
+
+async def stream_response(cursor, schema=None):
+    """Streams a Motor cursor as a JSON array, encoding one document at a time.
+
+    The first batch is read and encoded before the response starts, so a failing
+    query or a document that can't be encoded still gives an error status instead
+    of a 200 with its body cut short.
+    """
+    first = await db.first_batch(cursor, STREAM_FIRST_BATCH)
+    head = b",".join(_encode(document, schema) for document in first)
+    more = len(first) == STREAM_FIRST_BATCH
+    return StreamingResponse(_stream_json_array(head, more, cursor, schema), media_type="application/json")
+
+
+# Page size for the list endpoints, which would otherwise return whole collections
+DEFAULT_LIST_LIMIT = 200
+MAX_LIST_LIMIT = 1000
+
+
+# Left out of responses unless the caller picks fields explicitly; password is never returned
+DEFAULT_PROJECTION = {"_id": 0, "password": 0}
+
+
+def build_projection(fields: Optional[str] = None, default: dict = DEFAULT_PROJECTION):
+    """Builds a Mongo projection from a comma separated list of field names."""
+    names = [name.strip() for name in fields.split(",")] if fields else []
+    names = [name for name in names if name and name != "password"]
+    if not names:
+        return default
+    projection = dict.fromkeys(names, 1)
+    projection.setdefault("_id", 0)
+    return projection
+
+
+def struct_projection(schema):
+    """Projects exactly the fields declared on a msgspec output schema."""
+    return build_projection(",".join(schema.__struct_fields__))
 
-def handle_non_utf8(value):
-    if isinstance(value, bytes):
-        return base64.b64encode(value).decode('utf-8')
+
+async def parse_body(request: Request, adapter: TypeAdapter):
+    """Parses the request body with orjson and validates it in one pass of a prebuilt adapter."""
+    body = await request.body()
+    if not body:
+        raise RequestValidationError([{"type": "missing", "loc": ("body",), "msg": "Field required", "input": None}])
     try:
-        return value.decode('utf-8')
-    except (UnicodeDecodeError, AttributeError):
-        return value
+        return adapter.validate_python(orjson.loads(body))
+    except orjson.JSONDecodeError as e:
+        raise RequestValidationError([{"type": "json_invalid", "loc": ("body", e.pos), "msg": "JSON decode error", "input": {}, "ctx": {"error": e.msg}}])
+    except ValidationError as e:
+        raise RequestValidationError([{**error, "loc": ("body", *error["loc"])} for error in e.errors(include_url=False)])
 
 
-def convert_objectid_to_str(obj):
-    if isinstance(obj, dict):
-        return {key: convert_objectid_to_str(value) if isinstance(value, (dict, list)) else str(value) if isinstance(value, ObjectId) else handle_non_utf8(value) for key, value in obj.items()}
-    elif isinstance(obj, list):
-        return [convert_objectid_to_str(item) for item in obj]
-    else:
-        return handle_non_utf8(obj)
+def body_openapi(adapter: TypeAdapter):
+    """Documents a request body that is validated by `parse_body` instead of FastAPI."""
+    schema = adapter.json_schema(ref_template="#/components/schemas/{model}")
+    schema.pop("$defs", None)
+    return {"requestBody": {"content": {"application/json": {"schema": schema}}, "required": True}}
 
 
-class Database:
-    def __init__(self, uri: str, db_name: str):
-        self.client: AsyncIOMotorClient = AsyncIOMotorClient(uri)
-        self.db = self.client[db_name]
+class ResponseCoder(Coder):
+    """Caches the already encoded body of a `json_response`."""
 
-    async def insert_one(self, collection_name: str, document: dict):
-        try:
-            collection = self.db[collection_name]
-            result = await collection.insert_one(document)
-            return result  
-        except Exception as e:
-            print(f"Error inserting document: {e}")
-            raise HTTPException(status_code=500, detail="Internal Server Error")
-
-    async def find_one(self, collection_name: str, query: dict):
-        try:
-            collection = self.db[collection_name]
-            document = await collection.find_one(query)
-            return convert_objectid_to_str(document) if document else None
-        except Exception as e:
-            print(f"Error finding document: {e}")
-            return None
-
-    async def update_one(self, collection_name: str, query: dict, update_data: dict):
-        try:
-            collection = self.db[collection_name]
-            result = await collection.update_one(query, {"$set": update_data})
-            return {"modified_count": result.modified_count}
-        except Exception as e:
-            print(f"Error updating document: {e}")
-            return {}
-
-    async def delete_one(self, collection_name: str, query: dict):
-        try:
-            collection = self.db[collection_name]
-            result = await collection.delete_one(query)
-            return {"deleted_count": result.deleted_count}
-        except Exception as e:
-            print(f"Error deleting document: {e}")
-            return {}
+    @classmethod
+    def encode(cls, value: Response) -> bytes:
+        return value.body
 
-    async def close(self):
-        self.client.close()
+    @classmethod
+    def decode(cls, value: bytes) -> Response:
+        return Response(value, media_type="application/json")
 
 
-app = FastAPI()
+app = FastAPI(default_response_class=ORJSONResponse)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -113,8 +168,8 @@ class Branch(BaseModel):
     branch_desc: str
     branch_added: Optional[datetime.datetime] = None
     branch_active: bool
-    restaurants_id: Optional[str]  
-    address_id: Optional[str]  
+    restaurants_id: Optional[str] = None
+    address_id: Optional[str] = None
 
 class Order(BaseModel):
     order_id: str
@@ -127,27 +182,7 @@ class Order(BaseModel):
     order_status: str
     order_date: datetime.datetime
 
-    
-
-
-    @model_validator(mode='before')
-    def convert_binary_fields_to_base64(cls, values):
-        if 'restaurants_id' in values and isinstance(values['restaurants_id'], Binary):
-            values['restaurants_id'] = base64.b64encode(values['restaurants_id']).decode('utf-8')
-        if 'address_id' in values and isinstance(values['address_id'], Binary):
-            values['address_id'] = base64.b64encode(values['address_id']).decode('utf-8')
-        return values
-
-    @model_validator(mode='after')
-    def convert_base64_to_binary(cls, values):
-        if 'restaurants_id' in values and isinstance(values['restaurants_id'], str):
-            values['restaurants_id'] = Binary(base64.b64decode(values['restaurants_id']))
-        if 'address_id' in values and isinstance(values['address_id'], str):
-            values['address_id'] = Binary(base64.b64decode(values['address_id']))
-        return values
-
-    class Config:
-        arbitrary_types_allowed = True  
+    model_config = ConfigDict(arbitrary_types_allowed=True)
 
 
 
@@ -165,8 +200,7 @@ class User(BaseModel):
     user_active: bool
     role: str
 
-    class Config:
-        arbitrary_types_allowed = True  
+    model_config = ConfigDict(arbitrary_types_allowed=True)
 
 class User(BaseModel):
     id: int
@@ -198,12 +232,156 @@ class MenuItem(BaseModel):
     item_price: float
     item_active: bool
 
-    class Config:
-        arbitrary_types_allowed = True  
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+
+# Output schemas used to encode the list endpoints with msgspec
+class BranchOut(msgspec.Struct):
+    branch_id: int
+    branch_name: str
+    branch_email: str
+    branch_phone: str
+    branch_website: str
+    branch_desc: str
+    branch_active: bool
+    branch_added: Optional[datetime.datetime] = None
+    # String ids, or bson.Binary on legacy documents; bytes are written out base64-encoded
+    restaurants_id: Any = None
+    address_id: Any = None
+
+
+class OrderOut(msgspec.Struct):
+    order_id: str
+    customer: dict
+    order_type: str
+    store: dict
+    items: List[dict]
+    total_price: float
+    payment_method: str
+    order_status: str
+    order_date: datetime.datetime
+
+
+class MenuItemOut(msgspec.Struct):
+    menu_id: int
+    menu_name: str
+    menu_description: str
+    menu_type: str
+    menu_added: datetime.datetime
+    menu_active: bool
+    restaurant_id: str
+    branch_id: int
+    item_id: int
+    item_name: str
+    item_description: str
+    item_price: float
+    item_active: bool
+
+
+_BRANCH_FIELDS, _BRANCH_GET = field_getter(Branch)
+_USER_FIELDS, _USER_GET = field_getter(User)
+_MENU_ITEM_FIELDS, _MENU_ITEM_GET = field_getter(MenuItem)
+_RESTAURANTS_FIELDS, _RESTAURANTS_GET = field_getter(restaurants)
+
+BRANCH_PROJECTION = struct_projection(BranchOut)
+ORDER_PROJECTION = struct_projection(OrderOut)
+MENU_ITEM_PROJECTION = struct_projection(MenuItemOut)
+
+# Built once at import so batch requests reuse the compiled validators
+branch_list_adapter = TypeAdapter(List[Branch])
+user_list_adapter = TypeAdapter(List[User])
+menu_item_list_adapter = TypeAdapter(List[MenuItem])
+order_list_adapter = TypeAdapter(List[Order])
+restaurants_list_adapter = TypeAdapter(List[restaurants])
+
+
+
+def _raise_http_error(action: str, error: Exception):
+    # Unordered batches keep going past bad documents, so say what did get written
+    if isinstance(error, BulkWriteError):
+        write_errors = error.details.get("writeErrors", [])
+        duplicates_only = bool(write_errors) and all(err.get("code") == 11000 for err in write_errors)
+        raise HTTPException(
+            status_code=409 if duplicates_only else 500,
+            detail={
+                "message": "Duplicate key in batch" if duplicates_only else "Batch insert failed",
+                "inserted": error.details.get("nInserted", 0),
+                "failed_indexes": [err["index"] for err in write_errors],
+                "write_concern_errors": [err.get("errmsg") for err in error.details.get("writeConcernErrors", [])],
+            },
+        )
+    if isinstance(error, DuplicateKeyError):
+        raise HTTPException(status_code=409, detail="Document with this key already exists")
+    raise HTTPException(status_code=500, detail="Internal Server Error")
+
+
+db = Database(client, MONGODB_DB_NAME, on_error=_raise_http_error)
+
+# Documents read by business key, kept briefly; writes evict their own entries
+_RCACHE = TTLCache(maxsize=10_000, ttl=5)
+
+
+def _read_cache_key(collection_name: str, query: dict):
+    return collection_name, frozenset(query.items())
+
 
+async def cached_find_one(collection_name: str, query: dict, fields: Optional[str] = None):
+    """find_one served from the read cache, unless the caller asks for specific fields."""
+    if fields:
+        return await db.find_one(collection_name, query, build_projection(fields))
+    key = _read_cache_key(collection_name, query)
+    document = _RCACHE.get(key)
+    if document is None:
+        document = await db.find_one(collection_name, query, DEFAULT_PROJECTION)
+        if document is not None:
+            _RCACHE[key] = document
+    return document
 
 
-db = Database(MONGODB_URI, MONGODB_DB_NAME)
+def evict_cached(collection_name: str, query: dict):
+    _RCACHE.pop(_read_cache_key(collection_name, query), None)
+
+
+async def find_one_response(collection_name: str, query: dict, projection: dict, not_found: str):
+    result = await db.find_one(collection_name, query, projection)
+    if result is not None:
+        return json_response(result)
+    raise HTTPException(status_code=404, detail=not_found)
+
+
+_INDEXES = [
+    ("Branch", "branch_id", True),
+    ("userData", "id", True),
+    ("menu", "item_id", True),
+    ("menu", "menu_id", False),
+    ("orders", "order_id", True),
+    ("restaurants", "restaurants_id", True),
+]
+
+
+async def ensure_indexes():
+    # Every CRUD endpoint looks documents up by these business keys
+    for collection_name, key, unique in _INDEXES:
+        try:
+            await db.db[collection_name].create_index(key, unique=unique)
+        except ServerSelectionTimeoutError as e:
+            # The server is unreachable; the remaining indexes would each wait out the same timeout
+            print(f"Error creating index {collection_name}.{key}: {e}")
+            return
+        except PyMongoError as e:
+            # Existing duplicates block a unique index; keep serving and let requests report their own errors
+            print(f"Error creating index {collection_name}.{key}: {e}")
+
+
+@app.on_event("startup")
+async def create_indexes():
+    # Run in the background so an unreachable server can't hold up startup
+    app.state.index_task = asyncio.create_task(ensure_indexes())
+
+
+@app.on_event("startup")
+async def init_cache():
+    FastAPICache.init(InMemoryBackend())
 
 
 
@@ -211,7 +389,7 @@ db = Database(MONGODB_URI, MONGODB_DB_NAME)
 async def create_branch(branch: Branch):
     if not branch.branch_added:
         branch.branch_added = datetime.datetime.now()  
-    branch_data = branch.dict()
+    branch_data = to_doc(branch, _BRANCH_FIELDS, _BRANCH_GET)
     result = await db.insert_one("Branch", branch_data)
 
     if result.acknowledged:
@@ -219,42 +397,61 @@ async def create_branch(branch: Branch):
     raise HTTPException(status_code=400, detail="Failed to create branch")
 
 
+@app.post("/create-branches/", openapi_extra=body_openapi(branch_list_adapter))
+async def create_branches(request: Request):
+    branches = await parse_body(request, branch_list_adapter)
+    if not branches:
+        raise HTTPException(status_code=400, detail="No branches provided")
+
+    now = datetime.datetime.now()
+    for branch in branches:
+        if not branch.branch_added:
+            branch.branch_added = now
+    result = await db.insert_many("Branch", branch_list_adapter.dump_python(branches))
+
+    if result.acknowledged:
+        return {"message": "Branches created successfully", "inserted": len(result.inserted_ids)}
+    raise HTTPException(status_code=400, detail="Failed to create branches")
+
+
+# Cached apart from the endpoint so free-form `fields` values never become cache keys
+@cache(expire=30, namespace="branch", coder=ResponseCoder)
+async def cached_branch(branch_id: int):
+    return await find_one_response("Branch", {"branch_id": branch_id}, DEFAULT_PROJECTION, "Branch not found")
+
+
 @app.get("/branch/{branch_id}")
-async def get_branch(branch_id: int):
-    result = await db.find_one("Branch", {"branch_id": branch_id})
-    if result:
-        return result
-    raise HTTPException(status_code=404, detail="Branch not found")
+async def get_branch(branch_id: int, fields: Optional[str] = None):
+    if fields:
+        return await find_one_response("Branch", {"branch_id": branch_id}, build_projection(fields), "Branch not found")
+    return await cached_branch(branch_id)
 
 
 @app.put("/branch/{branch_id}")
 async def update_branch(branch_id: int, branch: Branch):
-    branch_dict = branch.dict(exclude_unset=True)
+    branch_dict = branch.model_dump(exclude_unset=True)
     if not branch_dict:
         raise HTTPException(status_code=400, detail="No data provided to update")
 
-    result = await db.update_one("Branch", {"branch_id": branch_id}, branch_dict)
-    if result and result.get("modified_count", 0) > 0:
-        return {"message": "Branch updated successfully"}
-    raise HTTPException(status_code=400, detail="Failed to update branch")
+    result = await db.find_one_and_update("Branch", {"branch_id": branch_id}, branch_dict)
+    if result is None:
+        raise HTTPException(status_code=404, detail="Branch not found")
+    await FastAPICache.clear(namespace="branch")
+    return {"message": "Branch updated successfully"}
 
 
 @app.delete("/branch/{branch_id}")
 async def delete_branch(branch_id: int):
-    branch = await db.find_one("Branch", {"branch_id": branch_id})
-    if not branch:
-        raise HTTPException(status_code=400, detail="Branch not found")
-
-    result = await db.delete_one("Branch", {"branch_id": branch_id})
-    if result and result.get("deleted_count", 0) > 0:
-        return {"message": "Branch deleted successfully"}
-    raise HTTPException(status_code=400, detail="Failed to delete branch")
+    branch = await db.find_one_and_delete("Branch", {"branch_id": branch_id})
+    if branch is None:
+        raise HTTPException(status_code=404, detail="Branch not found")
+    await FastAPICache.clear(namespace="branch")
+    return {"message": "Branch deleted successfully"}
 
 
 @app.get("/branches/")
-async def get_all_branches():
-    branches = await db.db["Branch"].find().to_list(length=200)
-    return convert_objectid_to_str(branches)
+async def get_all_branches(limit: int = Query(DEFAULT_LIST_LIMIT, ge=1, le=MAX_LIST_LIMIT)):
+    return await stream_response(db.db["Branch"].find({}, BRANCH_PROJECTION, limit=limit), BranchOut)
 
 
 
@@ -262,7 +459,7 @@ async def get_all_branches():
 
 @app.post("/create-user/")
 async def create_user(user: User):
-    user_data = user.dict()
+    user_data = to_doc(user, _USER_FIELDS, _USER_GET)
     result = await db.insert_one("userData", user_data)
 
     if result.acknowledged:
@@ -270,42 +467,52 @@ async def create_user(user: User):
     raise HTTPException(status_code=400, detail="Failed to create user")
 
 
+@app.post("/create-users/", openapi_extra=body_openapi(user_list_adapter))
+async def create_users(request: Request):
+    users = await parse_body(request, user_list_adapter)
+    if not users:
+        raise HTTPException(status_code=400, detail="No users provided")
+
+    result = await db.insert_many("userData", user_list_adapter.dump_python(users))
+
+    if result.acknowledged:
+        return {"message": "Users created successfully", "inserted": len(result.inserted_ids)}
+    raise HTTPException(status_code=400, detail="Failed to create users")
+
+
 @app.get("/user/{user_id}")
-async def get_user(user_id: int):
-    result = await db.find_one("userData", {"id": user_id})
-    if result:
-        return result
+async def get_user(user_id: int, fields: Optional[str] = None):
+    result = await cached_find_one("userData", {"id": user_id}, fields)
+    if result is not None:
+        return json_response(result)
     raise HTTPException(status_code=404, detail="User not found")
 
 
 @app.put("/user/{user_id}")
 async def update_user(user_id: int, user: User):
-    user_dict = user.dict(exclude_unset=True)
+    user_dict = user.model_dump(exclude_unset=True)
     if not user_dict:
         raise HTTPException(status_code=400, detail="No data provided to update")
 
-    result = await db.update_one("userData", {"id": user_id}, user_dict)
-    if result and result.get("modified_count", 0) > 0:
-        return {"message": "User updated successfully"}
-    raise HTTPException(status_code=400, detail="Failed to update user")
+    result = await db.find_one_and_update("userData", {"id": user_id}, user_dict)
+    if result is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    evict_cached("userData", {"id": user_id})
+    return {"message": "User updated successfully"}
 
 
 @app.delete("/user/{user_id}")
 async def delete_user(user_id: int):
-    user = await db.find_one("userData", {"id": user_id})
-    if not user:
-        raise HTTPException(status_code=400, detail="User not found")
-
-    result = await db.delete_one("userData", {"id": user_id})
-    if result and result.get("deleted_count", 0) > 0:
-        return {"message": "User deleted successfully"}
-    raise HTTPException(status_code=400, detail="Failed to delete user")
+    user = await db.find_one_and_delete("userData", {"id": user_id})
+    if user is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    evict_cached("userData", {"id": user_id})
+    return {"message": "User deleted successfully"}
 
 
 @app.get("/users/")
-async def get_all_users():
-    users = await db.db["userData"].find().to_list(length=200)
-    return convert_objectid_to_str(users)
+async def get_all_users(fields: Optional[str] = None, limit: int = Query(DEFAULT_LIST_LIMIT, ge=1, le=MAX_LIST_LIMIT)):
+    return await stream_response(db.db["userData"].find({}, build_projection(fields), limit=limit))
 
 
 
@@ -313,14 +520,7 @@ async def get_all_users():
 @app.post("/create-menu-item/")
 async def create_menu_item(item: MenuItem):
     
-    item_data = item.dict()
-
-    
-    if isinstance(item_data.get('restaurant_id'), Binary):
-        item_data['restaurant_id'] = base64.b64encode(item_data['restaurant_id']).decode('utf-8')
-
-    if isinstance(item_data.get('branch_id'), Binary):
-        item_data['branch_id'] = base64.b64encode(item_data['branch_id']).decode('utf-8')
+    item_data = to_doc(item, _MENU_ITEM_FIELDS, _MENU_ITEM_GET)
 
     
     try:
@@ -328,77 +528,85 @@ async def create_menu_item(item: MenuItem):
 
         
         if result.acknowledged:
+            await FastAPICache.clear(namespace="menu")
             return {"message": "Menu item created successfully", "item_id": item.item_id}
         else:
             raise HTTPException(status_code=400, detail="Failed to create menu item")
-    
+
+    except HTTPException:
+        raise
     except Exception as e:
         
         print(f"Error creating menu item: {e}")
         raise HTTPException(status_code=500, detail="Internal Server Error")
 
 
+@app.post("/create-menu-items/", openapi_extra=body_openapi(menu_item_list_adapter))
+async def create_menu_items(request: Request):
+    items = await parse_body(request, menu_item_list_adapter)
+    if not items:
+        raise HTTPException(status_code=400, detail="No menu items provided")
+
+    result = await db.insert_many("menu", menu_item_list_adapter.dump_python(items))
+
+    if result.acknowledged:
+        await FastAPICache.clear(namespace="menu")
+        return {"message": "Menu items created successfully", "inserted": len(result.inserted_ids)}
+    raise HTTPException(status_code=400, detail="Failed to create menu items")
+
+
+
+@cache(expire=30, namespace="menu", coder=ResponseCoder)
+async def cached_menu_item(menu_id: int):
+    return await find_one_response("menu", {"menu_id": menu_id}, DEFAULT_PROJECTION, "Menu item not found")
+
 
 @app.get("/menu-item/{menu_id}")
-async def get_menu_item(menu_id: int):
+async def get_menu_item(menu_id: int, fields: Optional[str] = None):
     
-    result = await db.find_one("menu", {"menu_id": menu_id})
-    if result:
-        return result
-    raise HTTPException(status_code=404, detail="Menu item not found")
+    if fields:
+        return await find_one_response("menu", {"menu_id": menu_id}, build_projection(fields), "Menu item not found")
+    return await cached_menu_item(menu_id)
 
 
 
 @app.put("/menu-item/{menu_id}")
 async def update_menu_item(menu_id: int, item: MenuItem):
-    existing_item = await db.find_one("menu", {"menu_id": menu_id})
-    if not existing_item:
-        raise HTTPException(status_code=404, detail=f"Menu item with menu_id {menu_id} not found")
-    
-    
-    item_dict = item.dict(exclude_unset=True)
+    item_dict = item.model_dump(exclude_unset=True)
     
     if not item_dict:
         raise HTTPException(status_code=400, detail="No data provided to update")
     
     
-    result = await db.db["menu"].replace_one({"menu_id": menu_id}, item_dict)
-
-    if result.modified_count > 0:
-        return {"message": "Menu item replaced successfully"}
-    else:
-        raise HTTPException(status_code=400, detail="Failed to replace menu item")
+    result = await db.find_one_and_replace("menu", {"menu_id": menu_id}, item_dict)
+    if result is None:
+        raise HTTPException(status_code=404, detail=f"Menu item with menu_id {menu_id} not found")
+    await FastAPICache.clear(namespace="menu")
+    return {"message": "Menu item replaced successfully"}
 
 
 @app.delete("/menu-item/{menu_id}")
 async def delete_menu_item(menu_id: int):
-    # Find the menu item by menu_id
-    menu_item = await db.find_one("menu", {"menu_id": menu_id})
-    
-    if not menu_item:
-        raise HTTPException(status_code=404, detail="Menu item not found")
-
-    # Attempt to delete the menu item from the database
-    result = await db.delete_one("menu", {"menu_id": menu_id})
-
-    # Check if the deletion was successful
-    if result and result.get("deleted_count", 0) > 0:
-        return {"message": "Menu item deleted successfully"}
+    # Delete the menu item by menu_id in a single round trip
+    menu_item = await db.find_one_and_delete("menu", {"menu_id": menu_id})
 
-    # If deletion fails, raise an exception
-    raise HTTPException(status_code=400, detail="Failed to delete menu item")
+    if menu_item is None:
+        raise HTTPException(status_code=404, detail="Menu item not found")
+    await FastAPICache.clear(namespace="menu")
+    return {"message": "Menu item deleted successfully"}
 
 
 
 @app.get("/menu-items/")
-async def get_all_menu_items():
-    menu_items = await db.db["menu"].find().to_list(length=200)
-    return convert_objectid_to_str(menu_items)
+@cache(expire=30, namespace="menu", coder=ResponseCoder)
+async def get_all_menu_items(limit: int = Query(DEFAULT_LIST_LIMIT, ge=1, le=MAX_LIST_LIMIT)):
+    menu_items = await db.db["menu"].find({}, MENU_ITEM_PROJECTION, limit=limit).to_list(length=limit)
+    return json_array_response(menu_items, MenuItemOut)
 
 
 @app.post("/create-order/")
 async def create_order(order: Order):
-    order_data = order.dict()
+    order_data = order.model_dump()
     result = await db.insert_one("orders", order_data)
 
     if result.acknowledged:
@@ -406,42 +614,52 @@ async def create_order(order: Order):
     raise HTTPException(status_code=400, detail="Failed to create order")
 
 
+@app.post("/create-orders/", openapi_extra=body_openapi(order_list_adapter))
+async def create_orders(request: Request):
+    orders = await parse_body(request, order_list_adapter)
+    if not orders:
+        raise HTTPException(status_code=400, detail="No orders provided")
+
+    result = await db.insert_many("orders", order_list_adapter.dump_python(orders))
+
+    if result.acknowledged:
+        return {"message": "Orders created successfully", "inserted": len(result.inserted_ids)}
+    raise HTTPException(status_code=400, detail="Failed to create orders")
+
+
 @app.get("/order/{order_id}")
-async def get_order(order_id: str):
-    result = await db.find_one("orders", {"order_id": order_id})
-    if result:
-        return result
+async def get_order(order_id: str, fields: Optional[str] = None):
+    result = await cached_find_one("orders", {"order_id": order_id}, fields)
+    if result is not None:
+        return json_response(result)
     raise HTTPException(status_code=404, detail="Order not found")
 
 
 @app.put("/order/{order_id}")
 async def update_order(order_id: str, order: Order):
-    order_dict = order.dict(exclude_unset=True)
+    order_dict = order.model_dump(exclude_unset=True)
     if not order_dict:
         raise HTTPException(status_code=400, detail="No data provided to update")
 
-    result = await db.update_one("orders", {"order_id": order_id}, order_dict)
-    if result and result.get("modified_count", 0) > 0:
-        return {"message": "Order updated successfully"}
-    raise HTTPException(status_code=404, detail="Order not found")
+    result = await db.find_one_and_update("orders", {"order_id": order_id}, order_dict)
+    if result is None:
+        raise HTTPException(status_code=404, detail="Order not found")
+    evict_cached("orders", {"order_id": order_id})
+    return {"message": "Order updated successfully"}
 
 
 @app.delete("/order/{order_id}")
 async def delete_order(order_id: str):
-    order = await db.find_one("orders", {"order_id": order_id})
-    if not order:
+    order = await db.find_one_and_delete("orders", {"order_id": order_id})
+    if order is None:
         raise HTTPException(status_code=404, detail="Order not found")
-
-    result = await db.delete_one("orders", {"order_id": order_id})
-    if result and result.get("deleted_count", 0) > 0:
-        return {"message": "Order deleted successfully"}
-    raise HTTPException(status_code=400, detail="Failed to delete order")
+    evict_cached("orders", {"order_id": order_id})
+    return {"message": "Order deleted successfully"}
 
 
 @app.get("/orders/")
-async def get_all_orders():
-    orders = await db.db["orders"].find().to_list(length=200)
-    return convert_objectid_to_str(orders)
+async def get_all_orders(limit: int = Query(DEFAULT_LIST_LIMIT, ge=1, le=MAX_LIST_LIMIT)):
+    return await stream_response(db.db["orders"].find({}, ORDER_PROJECTION, limit=limit), OrderOut)
 
 @app.post("/create-restaurants/")
 async def create_restaurants(restaurants: restaurants):
@@ -450,7 +668,7 @@ async def create_restaurants(restaurants: restaurants):
         restaurants.res_added = datetime.datetime.now()
 
     
-    restaurants_data = restaurants.dict()
+    restaurants_data = to_doc(restaurants, _RESTAURANTS_FIELDS, _RESTAURANTS_GET)
     result = await db.insert_one("restaurants", restaurants_data)
 
     
@@ -459,53 +677,70 @@ async def create_restaurants(restaurants: restaurants):
     raise HTTPException(status_code=400, detail="Failed to create restaurants")
 
 
+@app.post("/create-restaurants-bulk/", openapi_extra=body_openapi(restaurants_list_adapter))
+async def create_restaurants_bulk(request: Request):
+    restaurants_list = await parse_body(request, restaurants_list_adapter)
+    if not restaurants_list:
+        raise HTTPException(status_code=400, detail="No restaurants provided")
+
+    now = datetime.datetime.now()
+    for restaurants in restaurants_list:
+        if not restaurants.res_added:
+            restaurants.res_added = now
+    result = await db.insert_many("restaurants", restaurants_list_adapter.dump_python(restaurants_list))
+
+    if result.acknowledged:
+        return {"message": "restaurants created successfully", "inserted": len(result.inserted_ids)}
+    raise HTTPException(status_code=400, detail="Failed to create restaurants")
+
+
+@cache(expire=30, namespace="restaurants", coder=ResponseCoder)
+async def cached_restaurants(restaurants_id: int):
+    return await find_one_response("restaurants", {"restaurants_id": restaurants_id}, DEFAULT_PROJECTION, "restaurants not found")
+
+
 @app.get("/restaurants/{restaurants_id}")
-async def get_restaurants(restaurants_id: int):
+async def get_restaurants(restaurants_id: int, fields: Optional[str] = None):
     
-    result = await db.find_one("restaurants", {"restaurants_id": restaurants_id})
-    if result:
-        return result
-    raise HTTPException(status_code=404, detail="restaurants not found")
+    if fields:
+        return await find_one_response("restaurants", {"restaurants_id": restaurants_id}, build_projection(fields), "restaurants not found")
+    return await cached_restaurants(restaurants_id)
 
 
 @app.put("/restaurants/{restaurants_id}")
 async def update_restaurants(restaurants_id: int, restaurants: restaurants):
     
-    restaurants_dict = restaurants.dict(exclude_unset=True)
+    restaurants_dict = restaurants.model_dump(exclude_unset=True)
     if not restaurants_dict:
         raise HTTPException(status_code=400, detail="No data provided to update")
 
     
-    result = await db.update_one("restaurants", {"restaurants_id": restaurants_id}, restaurants_dict)
-    if result and result.get("modified_count", 0) > 0:
-        return {"message": "restaurants updated successfully"}
-    raise HTTPException(status_code=400, detail="Failed to update restaurants")
+    result = await db.find_one_and_update("restaurants", {"restaurants_id": restaurants_id}, restaurants_dict)
+    if result is None:
+        raise HTTPException(status_code=404, detail="restaurants not found")
+    await FastAPICache.clear(namespace="restaurants")
+    return {"message": "restaurants updated successfully"}
 
 
 @app.delete("/restaurants/{restaurants_id}")
 async def delete_restaurants(restaurants_id: int):
     
-    restaurants = await db.find_one("restaurants", {"restaurants_id": restaurants_id})
-    if not restaurants:
-        raise HTTPException(status_code=400, detail="restaurants not found")
-
-    
-    result = await db.delete_one("restaurants", {"restaurants_id": restaurants_id})
-    if result and result.get("deleted_count", 0) > 0:
-        return {"message": "restaurants deleted successfully"}
-    raise HTTPException(status_code=400, detail="Failed to delete restaurants")
+    restaurants = await db.find_one_and_delete("restaurants", {"restaurants_id": restaurants_id})
+    if restaurants is None:
+        raise HTTPException(status_code=404, detail="restaurants not found")
+    await FastAPICache.clear(namespace="restaurants")
+    return {"message": "restaurants deleted successfully"}
 
 
 @app.get("/restaurants/")
-async def get_all_restaurantss():
+async def get_all_restaurantss(fields: Optional[str] = None, limit: int = Query(DEFAULT_LIST_LIMIT, ge=1, le=MAX_LIST_LIMIT)):
     
-    restaurantss = await db.db["restaurants"].find().to_list(length=200)
-    return convert_objectid_to_str(restaurantss)
+    return await stream_response(db.db["restaurants"].find({}, build_projection(fields), limit=limit))
 
 
 @app.post("/create-user/")
 async def create_user(user: User):
-    user_data = user.dict()
+    user_data = to_doc(user, _USER_FIELDS, _USER_GET)
 
     # Attempt to insert the user data into the database
     try:
@@ -525,7 +760,7 @@ async def get_user(user_id: int):
     # Retrieve user details by user_id
     result = await db.find_one("userData", {"id": user_id})
     if result:
-        return result
+        return json_response(result)
     raise HTTPException(status_code=404, detail=f"User with id {user_id} not found")
 
 @app.put("/user/{user_id}")
@@ -535,7 +770,7 @@ async def update_user(user_id: int, user: User):
     if not existing_user:
         raise HTTPException(status_code=404, detail=f"User with id {user_id} not found")
 
-    user_dict = user.dict(exclude_unset=True)
+    user_dict = user.model_dump(exclude_unset=True)
 
     if not user_dict:
         raise HTTPException(status_code=400, detail="No data provided to update")
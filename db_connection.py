@@ -1,21 +1,43 @@
 from motor.motor_asyncio import AsyncIOMotorClient
-from dotenv import load_dotenv
+from pymongo import ReturnDocument
+from mongo import client, MONGODB_DB_NAME
+from typing import Callable, List, Optional
+from operator import attrgetter
 import asyncio
-import os
 import datetime
 
-load_dotenv()
+__all__ = ["Database", "db", "field_getter", "to_doc"]
 
-MONGODB_URI = os.getenv("MONGODB_URI")
-MONGODB_DB_NAME = os.getenv("MONGODB_DB_NAME")
+# Write paths only need to know whether a document matched
+ID_PROJECTION = {"_id": 1}
 
-if not MONGODB_URI or not MONGODB_DB_NAME:
-    raise ValueError("Required MongoDB configuration is missing in the .env file")
+def field_getter(model_cls):
+    """ Precompute the field names of a flat model and a getter for all of them at once """
+    fields = tuple(model_cls.model_fields)
+    if not fields:
+        raise ValueError(f"{model_cls.__name__} has no fields")
+    getter = attrgetter(*fields)
+    if len(fields) == 1:
+        # attrgetter with a single name returns the bare value, not a 1-tuple
+        return fields, lambda model: (getter(model),)
+    return fields, getter
+
+def to_doc(model, fields, getter):
+    """ Build a Mongo document from a flat model without going through model_dump """
+    return dict(zip(fields, getter(model)))
 
 class Database:
-    def __init__(self, uri: str, db_name: str):
-        self.client: AsyncIOMotorClient = AsyncIOMotorClient(uri)
+    def __init__(self, client: AsyncIOMotorClient, db_name: str, on_error: Optional[Callable[[str, Exception], None]] = None):
+        self.client = client
         self.db = self.client[db_name]
+        # Called with a description of the failed operation and the exception; may raise
+        self.on_error = on_error
+
+    def _handle_error(self, action: str, error: Exception, default=None):
+        print(f"Error {action}: {error}")
+        if self.on_error is not None:
+            self.on_error(action, error)
+        return default
 
     async def list_collection_names(self):
         """ List all collection names in the current database """
@@ -23,28 +45,38 @@ class Database:
             collections = await self.db.list_collection_names()
             return collections
         except Exception as e:
-            print(f"Error listing collections: {e}")
-            return []
+            return self._handle_error("listing collections", e, [])
+
+    async def first_batch(self, cursor, length: int):
+        """ Fetch up to length documents from a cursor; the cursor carries on after them """
+        try:
+            return await cursor.to_list(length=length)
+        except Exception as e:
+            return self._handle_error("reading cursor", e, [])
 
     async def insert_one(self, collection_name: str, document: dict):
         """ Insert a single document into the specified collection """
         try:
             collection = self.db[collection_name]
-            result = await collection.insert_one(document)
-            return {"_id": str(result.inserted_id)}  # return inserted id
+            return await collection.insert_one(document)
         except Exception as e:
-            print(f"Error inserting document: {e}")
-            return {}
+            return self._handle_error("inserting document", e)
 
-    async def find_one(self, collection_name: str, query: dict):
+    async def insert_many(self, collection_name: str, documents: List[dict]):
+        """ Insert documents in one unordered batch """
+        try:
+            collection = self.db[collection_name]
+            return await collection.insert_many(documents, ordered=False)
+        except Exception as e:
+            return self._handle_error("inserting documents", e)
+
+    async def find_one(self, collection_name: str, query: dict, projection: Optional[dict] = None):
         """ Find a single document in a collection by query """
         try:
             collection = self.db[collection_name]
-            document = await collection.find_one(query)
-            return document if document else {}
+            return await collection.find_one(query, projection)
         except Exception as e:
-            print(f"Error finding document: {e}")
-            return {}
+            return self._handle_error("finding document", e)
 
     async def update_one(self, collection_name: str, query: dict, update_data: dict):
         """ Update a single document in the collection """
@@ -53,8 +85,7 @@ class Database:
             result = await collection.update_one(query, {"$set": update_data})
             return {"modified_count": result.modified_count}
         except Exception as e:
-            print(f"Error updating document: {e}")
-            return {}
+            return self._handle_error("updating document", e, {})
 
     async def delete_one(self, collection_name: str, query: dict):
         """ Delete a single document from the collection """
@@ -63,8 +94,31 @@ class Database:
             result = await collection.delete_one(query)
             return {"deleted_count": result.deleted_count}
         except Exception as e:
-            print(f"Error deleting document: {e}")
-            return {}
+            return self._handle_error("deleting document", e, {})
+
+    async def find_one_and_update(self, collection_name: str, query: dict, update_data: dict, projection: Optional[dict] = ID_PROJECTION):
+        """ Update a single document and return it, or None if nothing matched """
+        try:
+            collection = self.db[collection_name]
+            return await collection.find_one_and_update(query, {"$set": update_data}, projection=projection, return_document=ReturnDocument.AFTER)
+        except Exception as e:
+            return self._handle_error("updating document", e)
+
+    async def find_one_and_replace(self, collection_name: str, query: dict, document: dict, projection: Optional[dict] = ID_PROJECTION):
+        """ Replace a single document and return it, or None if nothing matched """
+        try:
+            collection = self.db[collection_name]
+            return await collection.find_one_and_replace(query, document, projection=projection, return_document=ReturnDocument.AFTER)
+        except Exception as e:
+            return self._handle_error("replacing document", e)
+
+    async def find_one_and_delete(self, collection_name: str, query: dict, projection: Optional[dict] = ID_PROJECTION):
+        """ Delete a single document and return it, or None if nothing matched """
+        try:
+            collection = self.db[collection_name]
+            return await collection.find_one_and_delete(query, projection=projection)
+        except Exception as e:
+            return self._handle_error("deleting document", e)
 
     async def close(self):
         """ Close the connection to the MongoDB server """
@@ -81,17 +135,17 @@ class Database:
             print("No collections found.")
 
 # Create a global database instance for use in other modules
-db = Database(MONGODB_URI, MONGODB_DB_NAME)
+db = Database(client, MONGODB_DB_NAME)
 
 async def test_insert():
     document = {"name": "Test Document", "created_at": datetime.datetime.now()}
     result = await db.insert_one("TestCollection", document)
-    print("Insert result:", result)
+    print("Insert result:", result.inserted_id if result else None)
 
 async def main():
     await test_insert()  # Insert a document into a collection
     await db.print_collections()  # Check collections again
-    await db.close()  # Don't forget to close the connection after operations are done
 
-# Run the asynchronous main function
-asyncio.run(main())
+# Run the asynchronous main function only when executed as a script
+if __name__ == "__main__":
+    asyncio.run(main())
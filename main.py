@@ -1,13 +1,20 @@
+import asyncio
 from fastapi import FastAPI, HTTPException, Depends
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, ConfigDict
 from typing import List, Optional
 import bcrypt
-from motor.motor_asyncio import AsyncIOMotorClient
+from anyio import to_thread
 from bson import ObjectId
+from bson.errors import InvalidId
+from pymongo.errors import DuplicateKeyError, PyMongoError
+from pydantic_core import core_schema
 from pydantic import EmailStr
+from mongo import client
+from db_connection import field_getter, to_doc
 
-app = FastAPI()
+app = FastAPI(default_response_class=ORJSONResponse)
 
 origins = [
     "http://localhost:4200",  # Replace with your frontend URL
@@ -21,9 +28,7 @@ app.add_middleware(
     allow_headers=["*"],  
 )
 
-# Database connection setup
-MONGO_URL = "mongodb://localhost:27017"  # Replace with your MongoDB URL
-client = AsyncIOMotorClient(MONGO_URL)
+# Database connection setup, sharing the process-wide Motor client
 db = client.admin_module  # Your database name
 
 # User collection in MongoDB
@@ -35,6 +40,34 @@ branches_collection = db.get_collection('branches')
 inventory_collection = db.get_collection('inventory')
 
 
+async def ensure_indexes():
+    # Registration looks users up by email and relies on it being unique
+    try:
+        await users_collection.create_index("email", unique=True)
+    except PyMongoError as e:
+        # Same as admin.ensure_indexes: log and keep serving
+        print(f"Error creating index users.email: {e}")
+
+
+@app.on_event("startup")
+async def create_indexes():
+    # Run in the background so an unreachable server can't hold up startup
+    app.state.index_task = asyncio.create_task(ensure_indexes())
+
+
+# Path parameter type for MongoDB ids, parsed once while FastAPI validates the request
+def parse_object_id(value: str) -> ObjectId:
+    try:
+        return ObjectId(value)
+    except InvalidId:
+        raise ValueError("Invalid ObjectId")
+
+class OID(str):
+    @classmethod
+    def __get_pydantic_core_schema__(cls, source_type, handler):
+        return core_schema.no_info_after_validator_function(parse_object_id, core_schema.str_schema())
+
+
 # Pydantic Models
 class User(BaseModel):
     full_name: str
@@ -47,56 +80,58 @@ class UserResponse(BaseModel):
     full_name: str
     email: str
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 class Item(BaseModel):
     name: str
     description: str
     price: float
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 class Menu(BaseModel):
     name: str
     items: List[str]  # List of item names or ids
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 class Customer(BaseModel):
     name: str
     email: str
     phone: str
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 class Branch(BaseModel):
     name: str
     location: str
     contact_number: str
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 class Inventory(BaseModel):
     item_name: str
     quantity: int
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
+
+
+# Field getters used to build Mongo documents from the flat models above
+_ITEM_FIELDS, _ITEM_GET = field_getter(Item)
+_MENU_FIELDS, _MENU_GET = field_getter(Menu)
+_CUSTOMER_FIELDS, _CUSTOMER_GET = field_getter(Customer)
+_BRANCH_FIELDS, _BRANCH_GET = field_getter(Branch)
+_INVENTORY_FIELDS, _INVENTORY_GET = field_getter(Inventory)
 
 
 # Utility functions for password hashing and verification
-def hash_password(password: str) -> str:
-    salt = bcrypt.gensalt()
-    hashed = bcrypt.hashpw(password.encode('utf-8'), salt)
+# bcrypt is deliberately slow, so run it in a worker thread to keep the event loop free
+async def hash_password(password: str) -> str:
+    hashed = await to_thread.run_sync(bcrypt.hashpw, password.encode('utf-8'), bcrypt.gensalt())
     return hashed.decode('utf-8')
 
-def verify_password(password: str, hashed_password: str) -> bool:
-    return bcrypt.checkpw(password.encode('utf-8'), hashed_password.encode('utf-8'))
+async def verify_password(password: str, hashed_password: str) -> bool:
+    return await to_thread.run_sync(bcrypt.checkpw, password.encode('utf-8'), hashed_password.encode('utf-8'))
 
 
 # Admin Tasks: CRUD Operations
@@ -118,7 +153,7 @@ async def register(user: User):
         raise HTTPException(status_code=400, detail="Email already registered")
 
     # Hash the password before storing it
-    hashed_password = hash_password(user.password)
+    hashed_password = await hash_password(user.password)
 
     # Create the user object to store in MongoDB
     new_user = {
@@ -128,53 +163,55 @@ async def register(user: User):
     }
 
     # Insert new user into MongoDB
-    await users_collection.insert_one(new_user)
-    
+    try:
+        await users_collection.insert_one(new_user)
+    except DuplicateKeyError:
+        # Lost a race with a concurrent registration for the same email
+        raise HTTPException(status_code=400, detail="Email already registered")
+
     return {"message": "Registration successful"}
 
 # Get all users (admin)
-@app.get("/admin/users", response_model=List[UserResponse])
+@app.get("/admin/users", response_model=None)
 async def get_all_users():
     users = await users_collection.find().to_list(100)
     
     if not users:
         raise HTTPException(status_code=404, detail="No users found")
 
-    # Transform the MongoDB response into a list of UserResponse models
-    return [{"full_name": user["full_name"], "email": user["email"]} for user in users]
+    # Documents come straight from MongoDB, so skip re-validating them
+    return [UserResponse.model_construct(full_name=user["full_name"], email=user["email"]) for user in users]
 
 
 # Admin CRUD for items
 @app.post("/admin/items", response_model=Item)
 async def create_item(item: Item):
-    item_dict = item.dict()
+    item_dict = to_doc(item, _ITEM_FIELDS, _ITEM_GET)
     result = await items_collection.insert_one(item_dict)
     item_dict['id'] = str(result.inserted_id)
     return item_dict
 
-@app.get("/admin/items/{item_id}", response_model=Item)
-async def get_item(item_id: str):
-    item = await items_collection.find_one({"_id": ObjectId(item_id)})
+@app.get("/admin/items/{item_id}", response_model=None)
+async def get_item(item_id: OID):
+    item = await items_collection.find_one({"_id": item_id})
     if not item:
         raise HTTPException(status_code=404, detail="Item not found")
-    item['id'] = str(item['_id'])
-    return item
+    return Item.model_construct(**item)
 
-@app.put("/admin/items/{item_id}", response_model=Item)
-async def update_item(item_id: str, item: Item):
+@app.put("/admin/items/{item_id}", response_model=None)
+async def update_item(item_id: OID, item: Item):
     updated_item = await items_collection.find_one_and_update(
-        {"_id": ObjectId(item_id)},
-        {"$set": item.dict()},
+        {"_id": item_id},
+        {"$set": to_doc(item, _ITEM_FIELDS, _ITEM_GET)},
         return_document=True
     )
     if not updated_item:
         raise HTTPException(status_code=404, detail="Item not found")
-    updated_item['id'] = str(updated_item['_id'])
-    return updated_item
+    return Item.model_construct(**updated_item)
 
 @app.delete("/admin/items/{item_id}")
-async def delete_item(item_id: str):
-    result = await items_collection.delete_one({"_id": ObjectId(item_id)})
+async def delete_item(item_id: OID):
+    result = await items_collection.delete_one({"_id": item_id})
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Item not found")
     return {"message": "Item deleted successfully"}
@@ -183,34 +220,32 @@ async def delete_item(item_id: str):
 # Admin CRUD for menu
 @app.post("/admin/menus", response_model=Menu)
 async def create_menu(menu: Menu):
-    menu_dict = menu.dict()
+    menu_dict = to_doc(menu, _MENU_FIELDS, _MENU_GET)
     result = await menus_collection.insert_one(menu_dict)
     menu_dict['id'] = str(result.inserted_id)
     return menu_dict
 
-@app.get("/admin/menus/{menu_id}", response_model=Menu)
-async def get_menu(menu_id: str):
-    menu = await menus_collection.find_one({"_id": ObjectId(menu_id)})
+@app.get("/admin/menus/{menu_id}", response_model=None)
+async def get_menu(menu_id: OID):
+    menu = await menus_collection.find_one({"_id": menu_id})
     if not menu:
         raise HTTPException(status_code=404, detail="Menu not found")
-    menu['id'] = str(menu['_id'])
-    return menu
+    return Menu.model_construct(**menu)
 
-@app.put("/admin/menus/{menu_id}", response_model=Menu)
-async def update_menu(menu_id: str, menu: Menu):
+@app.put("/admin/menus/{menu_id}", response_model=None)
+async def update_menu(menu_id: OID, menu: Menu):
     updated_menu = await menus_collection.find_one_and_update(
-        {"_id": ObjectId(menu_id)},
-        {"$set": menu.dict()},
+        {"_id": menu_id},
+        {"$set": to_doc(menu, _MENU_FIELDS, _MENU_GET)},
         return_document=True
     )
     if not updated_menu:
         raise HTTPException(status_code=404, detail="Menu not found")
-    updated_menu['id'] = str(updated_menu['_id'])
-    return updated_menu
+    return Menu.model_construct(**updated_menu)
 
 @app.delete("/admin/menus/{menu_id}")
-async def delete_menu(menu_id: str):
-    result = await menus_collection.delete_one({"_id": ObjectId(menu_id)})
+async def delete_menu(menu_id: OID):
+    result = await menus_collection.delete_one({"_id": menu_id})
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Menu not found")
     return {"message": "Menu deleted successfully"}
@@ -219,34 +254,32 @@ async def delete_menu(menu_id: str):
 # Admin CRUD for customers
 @app.post("/admin/customers", response_model=Customer)
 async def create_customer(customer: Customer):
-    customer_dict = customer.dict()
+    customer_dict = to_doc(customer, _CUSTOMER_FIELDS, _CUSTOMER_GET)
     result = await customers_collection.insert_one(customer_dict)
     customer_dict['id'] = str(result.inserted_id)
     return customer_dict
 
-@app.get("/admin/customers/{customer_id}", response_model=Customer)
-async def get_customer(customer_id: str):
-    customer = await customers_collection.find_one({"_id": ObjectId(customer_id)})
+@app.get("/admin/customers/{customer_id}", response_model=None)
+async def get_customer(customer_id: OID):
+    customer = await customers_collection.find_one({"_id": customer_id})
     if not customer:
         raise HTTPException(status_code=404, detail="Customer not found")
-    customer['id'] = str(customer['_id'])
-    return customer
+    return Customer.model_construct(**customer)
 
-@app.put("/admin/customers/{customer_id}", response_model=Customer)
-async def update_customer(customer_id: str, customer: Customer):
+@app.put("/admin/customers/{customer_id}", response_model=None)
+async def update_customer(customer_id: OID, customer: Customer):
     updated_customer = await customers_collection.find_one_and_update(
-        {"_id": ObjectId(customer_id)},
-        {"$set": customer.dict()},
+        {"_id": customer_id},
+        {"$set": to_doc(customer, _CUSTOMER_FIELDS, _CUSTOMER_GET)},
         return_document=True
     )
     if not updated_customer:
         raise HTTPException(status_code=404, detail="Customer not found")
-    updated_customer['id'] = str(updated_customer['_id'])
-    return updated_customer
+    return Customer.model_construct(**updated_customer)
 
 @app.delete("/admin/customers/{customer_id}")
-async def delete_customer(customer_id: str):
-    result = await customers_collection.delete_one({"_id": ObjectId(customer_id)})
+async def delete_customer(customer_id: OID):
+    result = await customers_collection.delete_one({"_id": customer_id})
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Customer not found")
     return {"message": "Customer deleted successfully"}
@@ -255,34 +288,32 @@ async def delete_customer(customer_id: str):
 # Admin CRUD for branches
 @app.post("/admin/branches", response_model=Branch)
 async def create_branch(branch: Branch):
-    branch_dict = branch.dict()
+    branch_dict = to_doc(branch, _BRANCH_FIELDS, _BRANCH_GET)
     result = await branches_collection.insert_one(branch_dict)
     branch_dict['id'] = str(result.inserted_id)
     return branch_dict
 
-@app.get("/admin/branches/{branch_id}", response_model=Branch)
-async def get_branch(branch_id: str):
-    branch = await branches_collection.find_one({"_id": ObjectId(branch_id)})
+@app.get("/admin/branches/{branch_id}", response_model=None)
+async def get_branch(branch_id: OID):
+    branch = await branches_collection.find_one({"_id": branch_id})
     if not branch:
         raise HTTPException(status_code=404, detail="Branch not found")
-    branch['id'] = str(branch['_id'])
-    return branch
+    return Branch.model_construct(**branch)
 
-@app.put("/admin/branches/{branch_id}", response_model=Branch)
-async def update_branch(branch_id: str, branch: Branch):
+@app.put("/admin/branches/{branch_id}", response_model=None)
+async def update_branch(branch_id: OID, branch: Branch):
     updated_branch = await branches_collection.find_one_and_update(
-        {"_id": ObjectId(branch_id)},
-        {"$set": branch.dict()},
+        {"_id": branch_id},
+        {"$set": to_doc(branch, _BRANCH_FIELDS, _BRANCH_GET)},
         return_document=True
     )
     if not updated_branch:
         raise HTTPException(status_code=404, detail="Branch not found")
-    updated_branch['id'] = str(updated_branch['_id'])
-    return updated_branch
+    return Branch.model_construct(**updated_branch)
 
 @app.delete("/admin/branches/{branch_id}")
-async def delete_branch(branch_id: str):
-    result = await branches_collection.delete_one({"_id": ObjectId(branch_id)})
+async def delete_branch(branch_id: OID):
+    result = await branches_collection.delete_one({"_id": branch_id})
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Branch not found")
     return {"message": "Branch deleted successfully"}
@@ -291,34 +322,32 @@ async def delete_branch(branch_id: str):
 # Admin CRUD for inventory
 @app.post("/admin/inventory", response_model=Inventory)
 async def create_inventory(inventory: Inventory):
-    inventory_dict = inventory.dict()
+    inventory_dict = to_doc(inventory, _INVENTORY_FIELDS, _INVENTORY_GET)
     result = await inventory_collection.insert_one(inventory_dict)
     inventory_dict['id'] = str(result.inserted_id)
     return inventory_dict
 
-@app.get("/admin/inventory/{inventory_id}", response_model=Inventory)
-async def get_inventory(inventory_id: str):
-    inventory = await inventory_collection.find_one({"_id": ObjectId(inventory_id)})
+@app.get("/admin/inventory/{inventory_id}", response_model=None)
+async def get_inventory(inventory_id: OID):
+    inventory = await inventory_collection.find_one({"_id": inventory_id})
     if not inventory:
         raise HTTPException(status_code=404, detail="Inventory item not found")
-    inventory['id'] = str(inventory['_id'])
-    return inventory
+    return Inventory.model_construct(**inventory)
 
-@app.put("/admin/inventory/{inventory_id}", response_model=Inventory)
-async def update_inventory(inventory_id: str, inventory: Inventory):
+@app.put("/admin/inventory/{inventory_id}", response_model=None)
+async def update_inventory(inventory_id: OID, inventory: Inventory):
     updated_inventory = await inventory_collection.find_one_and_update(
-        {"_id": ObjectId(inventory_id)},
-        {"$set": inventory.dict()},
+        {"_id": inventory_id},
+        {"$set": to_doc(inventory, _INVENTORY_FIELDS, _INVENTORY_GET)},
         return_document=True
     )
     if not updated_inventory:
         raise HTTPException(status_code=404, detail="Inventory item not found")
-    updated_inventory['id'] = str(updated_inventory['_id'])
-    return updated_inventory
+    return Inventory.model_construct(**updated_inventory)
 
 @app.delete("/admin/inventory/{inventory_id}")
-async def delete_inventory(inventory_id: str):
-    result = await inventory_collection.delete_one({"_id": ObjectId(inventory_id)})
+async def delete_inventory(inventory_id: OID):
+    result = await inventory_collection.delete_one({"_id": inventory_id})
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Inventory item not found")
     return {"message": "Inventory item deleted successfully"}
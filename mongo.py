@@ -0,0 +1,15 @@
+from motor.motor_asyncio import AsyncIOMotorClient
+from dotenv import load_dotenv
+import os
+
+load_dotenv()
+
+MONGODB_URI = os.getenv("MONGODB_URI")
+MONGODB_DB_NAME = os.getenv("MONGODB_DB_NAME")
+
+if not MONGODB_URI or not MONGODB_DB_NAME:
+    raise ValueError("Required MongoDB configuration is missing in the .env file")
+
+# A single client shared by every module, so the whole process uses one connection pool
+client = AsyncIOMotorClient(MONGODB_URI, maxPoolSize=200, minPoolSize=20, waitQueueTimeoutMS=2000)
+db = client[MONGODB_DB_NAME]
@@ -1,9 +1,14 @@
-from fastapi import FastAPI, HTTPException
+import hashlib
+import os
+import orjson
+from anyio import to_thread
+from fastapi import FastAPI, HTTPException, Request, Response
+from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-from typing import List
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, ConfigDict
 
-app = FastAPI()
+app = FastAPI(default_response_class=ORJSONResponse)
 
 origins = [
     "http://localhost:4200",  
@@ -15,8 +20,9 @@ app.add_middleware(
     CORSMiddleware,
     allow_origins=origins,  
     allow_credentials=True,
-    allow_methods=["*"],  
-    allow_headers=["*"],  
+    allow_methods=["GET", "POST", "OPTIONS"],  
+    allow_headers=["content-type"],  
+    max_age=86400,  # let browsers cache preflight responses for a day
 )
 
 
@@ -27,37 +33,120 @@ class User(BaseModel):
     retype_password: str
     agree_terms: bool
 
+    model_config = ConfigDict(extra="ignore", validate_assignment=False, frozen=True)
+
 
 class UserResponse(BaseModel):
     full_name: str
     email: str
 
+    model_config = ConfigDict(extra="ignore", validate_assignment=False, frozen=True)
+
+
+# Field types of a registration payload, checked by hand instead of through the User model.
+# Spelled out rather than read from the annotations, which isinstance can't take in general
+# (Optional[str], EmailStr); keep in step with User.
+_USER_FIELDS = {
+    "full_name": str,
+    "email": str,
+    "password": str,
+    "retype_password": str,
+    "agree_terms": bool,
+}
+
+# Error type and message for each checked type, as pydantic reports them
+_TYPE_ERRORS = {
+    str: ("string_type", "Input should be a valid string"),
+    bool: ("bool_type", "Input should be a valid boolean"),
+}
+
+mock_db: dict[str, dict] = {}  # keyed by email
+
+# Bumped on every registration; /users re-encodes its payload only when this changes
+_version = 0
+_users_cache = (None, b"")
+
+# Pre-encoded body for the empty store; a fresh Response is still built per request because
+# middleware such as CORSMiddleware adds headers to the response it is given
+_EMPTY_BODY = orjson.dumps({"detail": "No users found"})
+
 
-mock_db = []
+def hash_password(password: str) -> dict:
+    # PBKDF2-HMAC-SHA256 goes through OpenSSL, which uses the CPU's SHA extensions when available
+    salt = os.urandom(16)
+    return {"salt": salt, "hash": hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), salt, 100_000)}
 
-@app.post("/register")
-async def register(user: User):
+@app.post(
+    "/register",
+    openapi_extra={"requestBody": {"content": {"application/json": {"schema": User.model_json_schema()}}, "required": True}},
+)
+async def register(request: Request):
+    body = await request.body()
+    if not body:
+        raise RequestValidationError([{"type": "missing", "loc": ("body",), "msg": "Field required", "input": None}])
+    try:
+        data = orjson.loads(body)
+    except orjson.JSONDecodeError as e:
+        raise RequestValidationError([{"type": "json_invalid", "loc": ("body", e.pos), "msg": "JSON decode error", "input": {}, "ctx": {"error": e.msg}}])
+    
+    if not isinstance(data, dict):
+        raise RequestValidationError([{"type": "dict_type", "loc": ("body",), "msg": "Input should be a valid dictionary", "input": data}])
+    errors = []
+    for field, field_type in _USER_FIELDS.items():
+        if field not in data:
+            errors.append({"type": "missing", "loc": ("body", field), "msg": "Field required", "input": data})
+        elif not isinstance(data[field], field_type):
+            error_type, msg = _TYPE_ERRORS[field_type]
+            errors.append({"type": error_type, "loc": ("body", field), "msg": msg, "input": data[field]})
+    if errors:
+        raise RequestValidationError(errors)
     
-    if user.password != user.retype_password:
+    if data["password"] != data["retype_password"]:
         raise HTTPException(status_code=400, detail="Passwords do not match")
     
     
-    if not user.agree_terms:
+    if not data["agree_terms"]:
         raise HTTPException(status_code=400, detail="You must agree to the terms")
     
+    if data["email"] in mock_db:
+        raise HTTPException(status_code=409, detail="Email already registered")
+    
+    # Hashing is CPU bound, so keep it off the event loop
+    password = await to_thread.run_sync(hash_password, data["password"])
+    
+    record = {
+        "full_name": data["full_name"],
+        "email": data["email"],
+        "password": password
+    }
+    # The same email may have been registered while the password was hashing
+    if mock_db.setdefault(data["email"], record) is not record:
+        raise HTTPException(status_code=409, detail="Email already registered")
     
-    mock_db.append({
-        "full_name": user.full_name,
-        "email": user.email,
-        "password": user.password  
-    })
+    global _version
+    _version += 1
     
     return {"message": "Registration successful"}
 
-@app.get("/users", response_model=List[UserResponse])
+# Deliberately async: the handler never blocks, and a plain def would be run in the threadpool
+@app.get("/users")
 async def get_all_users():
     
     if not mock_db:
-        raise HTTPException(status_code=404, detail="No users found")
+        return Response(_EMPTY_BODY, status_code=404, media_type="application/json")
     
-    return mock_db
+    global _users_cache
+    version, payload = _users_cache
+    if version != _version:
+        # Encoded in one go rather than streamed: the cached payload needs the whole body anyway.
+        # Build the public view directly instead of re-validating through UserResponse
+        payload = orjson.dumps([{"full_name": user["full_name"], "email": user["email"]} for user in mock_db.values()])
+        _users_cache = (_version, payload)
+    return Response(payload, media_type="application/json")
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    # uvloop and httptools keep the event loop and HTTP parsing in C
+    uvicorn.run("register:app", loop="uvloop", http="httptools")